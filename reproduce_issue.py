@@ -3,16 +3,19 @@ from urllib.parse import quote_plus
 import requests
 import io
 
+# Reused across calls so repeat fetches skip the TCP/TLS handshake
+session = requests.Session()
+session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
+})
+
 def fetch_fred(sid):
     url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={quote_plus(sid)}"
     print(f"Fetching {url}...")
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
-    }
     try:
-        response = requests.get(url, headers=headers)
+        response = session.get(url)
         response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text))
+        df = pd.read_csv(io.BytesIO(response.content))
         print("Success!")
         print(df.head())
     except Exception as e:
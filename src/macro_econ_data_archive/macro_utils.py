@@ -8,43 +8,197 @@ Extracted from generate_macro_report.py to enable reuse in both CLI and Streamli
 
 from __future__ import annotations
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import List, Union
 from urllib.parse import quote_plus
 import requests
+from requests.adapters import HTTPAdapter
 import io
 
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # transforms fall back to numexpr or pandas
+    njit = None
+
+try:
+    import numexpr
+except ImportError:  # transforms fall back to in-place numpy arithmetic
+    numexpr = None
+
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:  # CSVs are read with pandas' C parser
+    pyarrow = None
+
+
+SeriesOrFrame = Union[pd.Series, pd.DataFrame]
+
+# Inputs at least this long use the numba kernels, or numexpr without
+# numba; below it plain numpy is as fast as the dispatch overhead
+FAST_PATH_MIN_LENGTH = 10_000
+
 
 # --------------------------
 # Transform utilities
 # --------------------------
 
-def yoy(series: pd.Series, periods: int) -> pd.Series:
+if njit is not None:
+    # Kernels take a column-major (rows, columns) array, the layout of a
+    # pandas float block, and walk it one column at a time. They run
+    # serially: charts have a few columns at most, and numba's parallel
+    # threading layer can keep the interpreter from exiting once it is
+    # started from a worker thread, as Streamlit's script runner is.
+    # error_model="numpy" keeps pandas' division semantics (x/0 -> inf,
+    # 0/0 -> NaN) and no fastmath, so NaNs propagate exactly as before.
+    #
+    # Compilation happens on the first fast-path call, not at import (most
+    # charts never reach FAST_PATH_MIN_LENGTH), and cache=True stores the
+    # result in __pycache__ so later processes load it instead of compiling.
+    @njit(cache=True, error_model="numpy")
+    def _yoy_kernel(a, periods, out):
+        n = a.shape[0]
+        for j in range(a.shape[1]):
+            # Fill the leading rows separately so the main loop has no branch
+            for i in range(min(periods, n)):
+                out[i, j] = np.nan
+            for i in range(periods, n):
+                out[i, j] = 100.0 * (a[i, j] / a[i - periods, j] - 1.0)
+
+    @njit(cache=True, error_model="numpy")
+    def _qoq_saar_kernel(a, out):
+        for j in range(a.shape[1]):
+            if a.shape[0] > 0:
+                out[0, j] = np.nan
+            for i in range(1, a.shape[0]):
+                # Explicit product rather than the general power routine
+                r = a[i, j] / a[i - 1, j]
+                out[i, j] = 100.0 * (r * r * r * r - 1.0)
+
+# numexpr evaluates each expression in one fused, multithreaded pass over
+# the current and lagged slices, without shifted or ratio temporaries
+_YOY_EXPR = "100.0 * (x / lagged - 1.0)"
+_QOQ_SAAR_EXPR = "100.0 * ((x / lagged) ** 4 - 1.0)"
+
+
+def _use_fast_path(series: SeriesOrFrame) -> bool:
+    return (njit is not None or numexpr is not None) and len(series) >= FAST_PATH_MIN_LENGTH
+
+
+def _float_dtype(series: SeriesOrFrame):
+    """float32 only when every input column already is, else float64."""
+    dtypes = series.dtypes if isinstance(series, pd.DataFrame) else [series.dtype]
+    return np.float32 if all(dt == np.float32 for dt in dtypes) else np.float64
+
+
+def _wrap_like(series: SeriesOrFrame, values) -> SeriesOrFrame:
+    # values is always a freshly allocated result, so it is wrapped without
+    # the defensive copy pandas makes of ndarray input
+    if values.ndim == 1:
+        return pd.Series(values, index=series.index, name=series.name, copy=False)
+    return pd.DataFrame(values, index=series.index, columns=series.columns, copy=False)
+
+
+def _apply_kernel(series: SeriesOrFrame, kernel, *args) -> SeriesOrFrame:
+    """
+    Run a 2-D transform kernel over a Series (as one column) or a DataFrame.
+    
+    The kernel reads the input once and writes the result in place,
+    instead of materializing the shifted and ratio intermediates.
+    """
+    values = np.asfortranarray(series.to_numpy(dtype=_float_dtype(series), na_value=np.nan))
+    out = np.empty_like(values)
+    if values.ndim == 1:
+        kernel(values.reshape(-1, 1), *args, out.reshape(-1, 1))
+    else:
+        kernel(values, *args, out)
+    return _wrap_like(series, out)
+
+
+def _apply_numexpr(series: SeriesOrFrame, expr: str, periods: int) -> SeriesOrFrame:
+    """Evaluate a lagged-ratio expression with numexpr, NaN-filling the first rows."""
+    values = np.ascontiguousarray(series.to_numpy(dtype=_float_dtype(series), na_value=np.nan))
+    out = np.empty_like(values)
+    out[:periods] = np.nan
+    if periods < len(values):
+        numexpr.evaluate(
+            expr,
+            local_dict={"x": values[periods:], "lagged": values[:-periods]},
+            out=out[periods:]
+        )
+    return _wrap_like(series, out)
+
+
+def _apply_numpy(series: SeriesOrFrame, periods: int, power: int) -> SeriesOrFrame:
+    """
+    Compute 100 * ((x / x.shift(periods)) ** power - 1) in a single buffer.
+    
+    Each step writes back into the output array, avoiding the shifted copy
+    and the ratio/difference temporaries of the pandas expression.
+    """
+    values = series.to_numpy(dtype=_float_dtype(series), na_value=np.nan)
+    out = np.empty_like(values)
+    out[:periods] = np.nan
+    if periods >= len(values):
+        return _wrap_like(series, out)
+    
+    growth = out[periods:]
+    # Match pandas, which silences floating point warnings in arithmetic
+    with np.errstate(all="ignore"):
+        np.divide(values[periods:], values[:-periods], out=growth)
+        if power == 4:
+            # Two squarings rather than the general power routine
+            np.multiply(growth, growth, out=growth)
+            np.multiply(growth, growth, out=growth)
+        elif power != 1:
+            np.power(growth, power, out=growth)
+    growth -= 1.0
+    growth *= 100.0
+    return _wrap_like(series, out)
+
+
+def yoy(series: SeriesOrFrame, periods: int) -> SeriesOrFrame:
     """
     Year-over-year percent change for the given periodicity.
     
     Args:
-        series: Time series data
+        series: Time series data (a DataFrame transforms every column at once)
         periods: Number of periods for comparison (e.g., 12 for monthly, 4 for quarterly)
     
     Returns:
-        Series with YoY percent change
+        Series (or DataFrame) with YoY percent change
     """
-    return 100.0 * (series / series.shift(periods) - 1.0)
+    if periods <= 0:
+        return 100.0 * (series / series.shift(periods) - 1.0)
+    if _use_fast_path(series):
+        if njit is not None:
+            return _apply_kernel(series, _yoy_kernel, periods)
+        return _apply_numexpr(series, _YOY_EXPR, periods)
+    return _apply_numpy(series, periods, power=1)
 
 
-def qoq_saar(series: pd.Series) -> pd.Series:
+def qoq_saar(series: SeriesOrFrame) -> SeriesOrFrame:
     """
     Quarter-over-quarter change at a seasonally adjusted annual rate.
     
     Args:
-        series: Time series data
+        series: Time series data (a DataFrame transforms every column at once)
     
     Returns:
-        Series with QoQ SAAR percent change
+        Series (or DataFrame) with QoQ SAAR percent change
     """
-    return 100.0 * ((series / series.shift(1)) ** 4 - 1.0)
+    if _use_fast_path(series):
+        if njit is not None:
+            return _apply_kernel(series, _qoq_saar_kernel)
+        return _apply_numexpr(series, _QOQ_SAAR_EXPR, 1)
+    return _apply_numpy(series, 1, power=4)
 
 
 def safe_to_numeric(s: pd.Series) -> pd.Series:
@@ -57,9 +211,17 @@ def safe_to_numeric(s: pd.Series) -> pd.Series:
     Returns:
         Numeric series
     """
+    # The CSV reader usually delivers a numeric column already (see the
+    # na_values handling in _fetch_fred_series); skip the conversion pass
+    if pd.api.types.is_numeric_dtype(s):
+        return s
     return pd.to_numeric(s, errors="coerce")
 
 
+# Periods per year, keyed by the first letter of the frequency name
+_PERIODS_PER_YEAR = {"m": 12, "q": 4, "w": 52, "d": 365}
+
+
 def infer_yoy_periods(freq: str) -> int:
     """
     Infer the number of periods for year-over-year calculation based on frequency.
@@ -70,104 +232,271 @@ def infer_yoy_periods(freq: str) -> int:
     Returns:
         Number of periods in a year
     """
-    f = freq.lower()
-    if f.startswith("m"):
-        return 12
-    if f.startswith("q"):
-        return 4
-    if f.startswith("w"):
-        return 52
-    if f.startswith("d"):
-        return 365
     # default to 12
-    return 12
+    return _PERIODS_PER_YEAR.get(freq[:1].lower(), 12)
 
 
 # --------------------------
 # Data fetch
 # --------------------------
 
+FETCH_MAX_WORKERS = 16
+FETCH_TIMEOUT_SECONDS = 30
+
+# Parse with Arrow's multithreaded CSV reader when pyarrow is installed
+# (it ships with Streamlit); otherwise use pandas' C parser.
+_CSV_ENGINE = "pyarrow" if pyarrow is not None else "c"
+
+# FRED's date column, under its current and its legacy name
+_FRED_DATE_COLUMNS = ("observation_date", "DATE")
+
+# FRED publishes at most daily, so downloaded CSVs are reused from disk
+# for a day across processes and sessions
+CACHE_DIR = Path(os.environ.get("MACROECON_CACHE_DIR", Path.home() / ".cache" / "macroecon"))
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Use requests with a proper User-Agent to avoid 403 Forbidden
+_FRED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
+}
+
+# One keep-alive session for all FRED requests, so later series reuse open
+# TCP/TLS connections. The pool holds a connection per fetch worker.
+_SESSION = requests.Session()
+_SESSION.headers.update(_FRED_HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_MAX_WORKERS))
+
+
+def _fred_csv_url(series_ids: List[str], start: str) -> str:
+    """
+    Build the fredgraph.csv URL for one or more series.
+    
+    cosd trims the history server-side, so rows before start are never sent.
+    Like the other per-line graph parameters it takes one comma-separated
+    value per series.
+    """
+    ids = ",".join(series_ids)
+    cosd = ",".join([start] * len(series_ids))
+    return f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={quote_plus(ids)}&cosd={cosd}"
+
+
+def _write_fred_cache(path: Path, content: bytes) -> None:
+    """Store a response body in the disk cache, ignoring any filesystem error."""
+    tmp_name = None
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False) as tmp:
+            tmp_name = tmp.name
+            tmp.write(content)
+        os.replace(tmp_name, path)
+    except OSError:
+        if tmp_name is not None:
+            # Don't let failed writes pile up temp files in CACHE_DIR
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def _load_fred_csv(series_ids: List[str], start: str) -> pd.DataFrame:
+    """
+    Download and parse fredgraph.csv for one or more series, from the disk cache if fresh.
+    
+    A response is only cached once it has parsed, so an error page or
+    truncated body served with a 200 is not replayed from disk. The cache
+    is best-effort: an unreadable or unwritable cache directory falls back
+    to a plain download.
+    
+    Args:
+        series_ids: FRED series IDs, fetched together in one response
+        start: First observation date (YYYY-MM-DD), applied by FRED itself
+    
+    Returns:
+        DataFrame with one column per series, in series_ids order
+    
+    Raises:
+        requests.HTTPError: If FRED rejects the request (400 for an unknown ID)
+        ValueError: If the response is not a FRED CSV for these series
+    """
+    path = CACHE_DIR / f"{quote_plus(','.join(series_ids))}_{start}.csv"
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL_SECONDS:
+            return _parse_fred_csv(path.read_bytes(), series_ids)
+    except OSError:
+        pass
+    
+    response = _SESSION.get(_fred_csv_url(series_ids, start), timeout=FETCH_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    content = response.content
+    
+    frame = _parse_fred_csv(content, series_ids)
+    _write_fred_cache(path, content)
+    return frame
+
+
+def _read_fred_csv(body: bytes) -> pd.DataFrame:
+    """
+    Read a fredgraph.csv body, parsing the date column while reading.
+    
+    The raw response bytes are parsed directly (no intermediate str decode).
+    FRED marks missing observations with "."; reading it as NA lets the
+    value columns parse as numbers instead of strings.
+    """
+    if _CSV_ENGINE == "pyarrow":
+        # Left to itself Arrow infers ISO dates as date32, which pandas turns
+        # into an object column of datetime.date; ask for timestamps instead
+        options = pyarrow.csv.ConvertOptions(
+            null_values=["."],
+            column_types={c: pyarrow.timestamp("s") for c in _FRED_DATE_COLUMNS},
+        )
+        try:
+            return pyarrow.csv.read_csv(io.BytesIO(body), convert_options=options).to_pandas()
+        except pyarrow.ArrowInvalid:
+            pass  # e.g. a malformed date; the pandas reader below coerces it
+    return pd.read_csv(io.BytesIO(body), na_values=["."], parse_dates=[0], date_format="%Y-%m-%d")
+
+
+def _parse_fred_csv(body: bytes, series_ids: List[str]) -> pd.DataFrame:
+    """
+    Parse a fredgraph.csv body into numeric columns indexed by observation date.
+    
+    Args:
+        body: CSV response bytes
+        series_ids: Series IDs expected as columns in the response
+    
+    Returns:
+        DataFrame with one column per series, in series_ids order
+    
+    Raises:
+        ValueError: If the response is missing the date or a series column
+    """
+    raw = _read_fred_csv(body)
+    label = ", ".join(series_ids)
+    
+    date_col = next((c for c in _FRED_DATE_COLUMNS if c in raw.columns), None)
+    if date_col is None:
+        raise ValueError(f"Unexpected FRED response for series '{label}': missing date column")
+
+    if not pd.api.types.is_datetime64_any_dtype(raw[date_col]):
+        # Only malformed dates get here (the readers parse ISO dates
+        # themselves); coerce them to NaT
+        raw[date_col] = pd.to_datetime(raw[date_col], errors="coerce")
+    if raw[date_col].hasnans:
+        raw = raw.dropna(subset=[date_col])
+    raw = raw.set_index(date_col).sort_index()
+
+    for sid in series_ids:
+        if sid not in raw.columns:
+            raise ValueError(f"Unexpected FRED response for series '{sid}': missing '{sid}' column")
+        raw[sid] = safe_to_numeric(raw[sid])
+
+    return raw[series_ids]
+
+
+def _fetch_fred_series(sid: str, start_ts: pd.Timestamp) -> pd.Series:
+    """
+    Download and parse a single FRED series.
+    
+    Args:
+        sid: FRED series ID
+        start_ts: First observation date to keep
+    
+    Returns:
+        Numeric series indexed by observation date
+    
+    Raises:
+        Exception: If data cannot be fetched from FRED
+    """
+    try:
+        frame = _load_fred_csv([sid], start_ts.strftime("%Y-%m-%d"))
+        # cosd already trims server-side; this cheap slice of the sorted
+        # index keeps both fetch paths correct should FRED ignore it
+        return frame[sid].loc[start_ts:]
+        
+    except Exception as e:
+        # Re-raise with context
+        raise Exception(f"Failed to fetch data for {sid}: {str(e)}")
+
+
 def fetch_fred(series_ids: List[str], start: str = "1990-01-01") -> pd.DataFrame:
     """
     Fetch series from FRED via the public `fredgraph.csv` endpoint (no API key).
     
+    Several series are requested together in a single `id=A,B,...` call,
+    which FRED returns as one CSV aligned on the union of their dates. If
+    FRED rejects the batch (an unknown ID fails the whole request with a
+    400), the series are downloaded individually instead, concurrently (up
+    to FETCH_MAX_WORKERS at a time), so the error names the bad series.
+    Responses are cached under CACHE_DIR for CACHE_TTL_SECONDS.
+    
     Args:
         series_ids: List of FRED series IDs to fetch
         start: Start date for data (YYYY-MM-DD format)
     
     Returns:
-        DataFrame with fetched series as columns
+        DataFrame with fetched series as columns, in series_ids order
     
     Raises:
         Exception: If data cannot be fetched from FRED
     """
     start_ts = pd.to_datetime(start)
-    df = pd.DataFrame()
+    series_ids = list(dict.fromkeys(series_ids))
+    if not series_ids:
+        return pd.DataFrame()
     
-    # Use requests with a proper User-Agent to avoid 403 Forbidden
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
-    }
+    if len(series_ids) == 1:
+        # Single-series charts (every Streamlit chart) need neither a thread
+        # pool nor alignment
+        sid = series_ids[0]
+        return _fetch_fred_series(sid, start_ts).to_frame(sid)
     
-    for sid in series_ids:
-        url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={quote_plus(sid)}"
-        
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            # Read CSV from response content
-            raw = pd.read_csv(io.StringIO(response.text))
-            
-            if "DATE" in raw.columns:
-                date_col = "DATE"
-            elif "observation_date" in raw.columns:
-                date_col = "observation_date"
-            else:
-                raise ValueError(f"Unexpected FRED response for series '{sid}': missing date column")
-
-            raw[date_col] = pd.to_datetime(raw[date_col], errors="coerce")
-            raw = raw.dropna(subset=[date_col]).set_index(date_col).sort_index()
-
-            if sid not in raw.columns:
-                raise ValueError(f"Unexpected FRED response for series '{sid}': missing '{sid}' column")
-
-            s = safe_to_numeric(raw[sid])
-            s = s[s.index >= start_ts]
-            df[sid] = s
-            
-        except Exception as e:
-            # Re-raise with context
-            raise Exception(f"Failed to fetch data for {sid}: {str(e)}")
-            
-    return df
-
-
-def build_series_for_chart(df: pd.DataFrame, transform: str, frequency: str = "monthly") -> pd.DataFrame:
+    try:
+        frame = _load_fred_csv(series_ids, start_ts.strftime("%Y-%m-%d"))
+        # Same guard as _fetch_fred_series, for any line FRED didn't trim
+        return frame.loc[start_ts:]
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 400:
+            raise Exception(f"Failed to fetch data for {', '.join(series_ids)}: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Failed to fetch data for {', '.join(series_ids)}: {str(e)}")
+    
+    workers = min(FETCH_MAX_WORKERS, len(series_ids))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = list(pool.map(lambda sid: _fetch_fred_series(sid, start_ts), series_ids))
+    
+    # Build the frame in one pass (aligned on the union of dates) rather than
+    # growing it column by column
+    return pd.concat(dict(zip(series_ids, fetched)), axis=1, sort=True)
+
+
+def build_series_for_chart(df: SeriesOrFrame, transform: str, frequency: str = "monthly") -> SeriesOrFrame:
     """
     Apply transformation to dataframe based on specified transform type.
     
+    A single Series can be passed directly (as the Streamlit app does for
+    its one-series charts), which skips DataFrame overhead entirely.
+    
     Args:
-        df: Raw data DataFrame
+        df: Raw data DataFrame or Series
         transform: Type of transformation ("level", "yoy", or "qoq_saar")
         frequency: Data frequency for YoY calculation
     
     Returns:
-        Transformed DataFrame
+        Transformed DataFrame (or Series, matching the input). Levels are
+        the input itself, uncopied; treat the result as read-only.
     
     Raises:
         ValueError: If unknown transform type is specified
     """
-    out = pd.DataFrame(index=df.index)
     if transform == "level":
-        out = df.copy()
+        # Callers only derive new frames from the result (dropna), so the
+        # fetched data is passed through without a copy
+        out = df
     elif transform == "yoy":
-        periods = infer_yoy_periods(frequency)
-        for c in df.columns:
-            out[c] = yoy(df[c], periods=periods)
+        out = yoy(df, periods=infer_yoy_periods(frequency))
     elif transform == "qoq_saar":
-        for c in df.columns:
-            out[c] = qoq_saar(df[c])
+        out = qoq_saar(df)
     else:
         raise ValueError(f"Unknown transform: {transform}")
     return out
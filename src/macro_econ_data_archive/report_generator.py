@@ -12,14 +12,19 @@ This module lives under the src/ package so it can be reused by:
 from __future__ import annotations
 
 import argparse
+import io
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
-import matplotlib.pyplot as plt
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
 from reportlab.lib import colors
 from reportlab.lib.colors import HexColor
 from reportlab.lib.pagesizes import letter, landscape
@@ -37,6 +42,11 @@ from . import macro_utils
 EXIT_SUCCESS = 0
 EXIT_FAILURE = 1
 
+# Chart images are downscaled to this resolution at their drawn size and
+# embedded as JPEG
+PDF_IMAGE_DPI = 150
+PDF_JPEG_QUALITY = 85
+
 
 # --------------------------
 # Chart specification
@@ -64,25 +74,40 @@ class ChartSpec:
 def build_series_for_chart(df: pd.DataFrame, spec: ChartSpec) -> pd.DataFrame:
     return macro_utils.build_series_for_chart(df, transform=spec.transform, frequency=spec.frequency)
 
+# One Agg figure is reused for every chart; building a Figure and going
+# through pyplot per page is most of the fixed cost of a chart
+_CHART_FIG = None
+
+
+def _chart_figure() -> Figure:
+    """Return the shared chart figure, creating it on first use."""
+    global _CHART_FIG
+    if _CHART_FIG is None:
+        _CHART_FIG = Figure(figsize=(10.5, 6.5))
+        FigureCanvasAgg(_CHART_FIG)
+        _CHART_FIG.add_subplot(111)
+    return _CHART_FIG
+
 def render_chart(spec: ChartSpec, data: pd.DataFrame, out_png: Path) -> None:
     """
     Render a single-page time-series chart as a PNG (to embed in the PDF).
     """
-    plt.figure(figsize=(10.5, 6.5))
+    fig = _chart_figure()
+    ax = fig.axes[0]
+    ax.clear()
     for sid in data.columns:
         label = next((s.label for s in spec.series if s.id == sid), sid)
-        plt.plot(data.index, data[sid], label=label)
-    plt.title(spec.page_title)
-    plt.xlabel("")
+        ax.plot(data.index, data[sid].to_numpy(), label=label)
+    ax.set_title(spec.page_title)
+    ax.set_xlabel("")
     if spec.units:
-        plt.ylabel(spec.units)
-    plt.grid(True, linewidth=0.3, alpha=0.6)
+        ax.set_ylabel(spec.units)
+    ax.grid(True, linewidth=0.3, alpha=0.6)
     if len(data.columns) > 1:
-        plt.legend(loc="best", fontsize=8)
-    plt.tight_layout()
+        ax.legend(loc="best", fontsize=8)
+    fig.tight_layout()
     out_png.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(out_png, dpi=160)
-    plt.close()
+    fig.savefig(out_png, dpi=160)
 
 
 # --------------------------
@@ -105,10 +130,30 @@ def pdf_header_footer(c: canvas.Canvas, title: str, as_of: str, page_num: int) -
     c.drawRightString(w - 0.6 * inch, 0.35 * inch, f"Page {page_num}")
     c.restoreState()
 
+def chart_image_reader(png_path: Path, width: float, height: float) -> ImageReader:
+    """
+    Load a chart PNG downscaled to its drawn size (in points) and re-encoded as JPEG.
+    
+    ReportLab embeds JPEG data as-is, so this keeps large chart renders from
+    dominating PDF size and assembly time.
+    """
+    max_px = (int(width * PDF_IMAGE_DPI / 72), int(height * PDF_IMAGE_DPI / 72))
+    with Image.open(png_path) as im:
+        im.thumbnail(max_px, Image.BICUBIC)
+        if im.mode != "RGB":
+            # Flatten any transparency onto the white page background
+            rgba = im.convert("RGBA")
+            im = Image.new("RGB", rgba.size, "white")
+            im.paste(rgba, mask=rgba.getchannel("A"))
+        buf = io.BytesIO()
+        im.save(buf, "JPEG", quality=PDF_JPEG_QUALITY, optimize=True)
+    buf.seek(0)
+    return ImageReader(buf)
+
 def assemble_pdf(title: str, as_of: str, png_paths: List[Path], out_pdf: Path) -> None:
     w, h = landscape(letter)
     out_pdf.parent.mkdir(parents=True, exist_ok=True)
-    c = canvas.Canvas(str(out_pdf), pagesize=landscape(letter))
+    c = canvas.Canvas(str(out_pdf), pagesize=landscape(letter), pageCompression=1)
     page_num = 1
 
     # Cover
@@ -127,18 +172,27 @@ def assemble_pdf(title: str, as_of: str, png_paths: List[Path], out_pdf: Path) -
     c.showPage()
     page_num += 1
 
+    # Fit within margins under header
+    left = 0.6 * inch
+    right = 0.6 * inch
+    top = 0.8 * inch  # below header
+    bottom = 0.75 * inch
+    usable_w = w - left - right
+    usable_h = h - (0.5 * inch) - top - bottom
+
+    # Decode and downscale every chart up front. Pillow releases the GIL
+    # while decoding, resizing and encoding, so this runs across cores
+    # while the canvas itself is written sequentially.
+    images = []
+    if png_paths:
+        workers = min(os.cpu_count() or 1, len(png_paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            images = list(pool.map(lambda p: chart_image_reader(p, usable_w, usable_h), png_paths))
+
     # Chart pages
-    for p in png_paths:
+    for img in images:
         pdf_header_footer(c, title, as_of, page_num)
         # draw chart image area
-        img = ImageReader(str(p))
-        # Fit within margins under header
-        left = 0.6 * inch
-        right = 0.6 * inch
-        top = 0.8 * inch  # below header
-        bottom = 0.75 * inch
-        usable_w = w - left - right
-        usable_h = h - (0.5 * inch) - top - bottom
         c.drawImage(img, left, bottom, width=usable_w, height=usable_h, preserveAspectRatio=True, anchor="c")
         c.showPage()
         page_num += 1
@@ -185,11 +239,24 @@ def main():
     tmpdir = Path(args.tmpdir)
     pngs: List[Path] = []
 
-    for i, ch in enumerate(charts, start=1):
-        series_ids = [s.id for s in ch.series]
+    # Start every chart's download up front; rendering below consumes them
+    # in order, so total fetch time is bounded by the slowest chart rather
+    # than the sum of all of them. Charts plotting the same series share one
+    # download, and fetch errors surface from result().
+    pool = ThreadPoolExecutor(max_workers=max(1, min(macro_utils.FETCH_MAX_WORKERS, len(charts))))
+    by_ids = {}
+    fetches = []
+    for ch in charts:
+        series_ids = tuple(s.id for s in ch.series)
+        if series_ids not in by_ids:
+            by_ids[series_ids] = pool.submit(macro_utils.fetch_fred, list(series_ids), start=args.start)
+        fetches.append(by_ids[series_ids])
+    pool.shutdown(wait=False)
+
+    for i, (ch, fetch) in enumerate(zip(charts, fetches), start=1):
         print(f"Processing chart {i}/{len(charts)}: {ch.page_title}")
         try:
-            raw = macro_utils.fetch_fred(series_ids, start=args.start)
+            raw = fetch.result()
             transformed = build_series_for_chart(raw, ch).dropna(how="all")
             if transformed.empty:
                 print(f"  Warning: No data available for chart '{ch.page_title}'. Skipping.")
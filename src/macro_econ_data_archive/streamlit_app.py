@@ -5,19 +5,31 @@ streamlit_app.py - MacroBuilder Streamlit Application
 A dynamic, interactive application for creating custom economic reports with AI-powered insights.
 """
 
+import asyncio
 import os
 import io
 import json
+import functools
+import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 from openai import OpenAI
 
+try:
+    import kaleido
+except ImportError:  # PDF export reports the missing dependency when used
+    kaleido = None
+
 # Import utilities from our refactored module
 from .macro_utils import (
     fetch_fred,
@@ -43,6 +55,23 @@ st.set_page_config(
 )
 
 
+# Concurrent narrative requests for "Generate All Analyses"; the OpenAI
+# client retries rate-limited (429) calls with exponential backoff.
+NARRATIVE_MAX_WORKERS = 8
+OPENAI_MAX_RETRIES = 5
+NARRATIVE_TEMPERATURE = 0.7
+NARRATIVE_MAX_TOKENS = 500
+
+# Static chart export size (layout pixels)
+PNG_WIDTH = 1050
+PNG_HEIGHT = 650
+PNG_SCALE = 2
+
+# Kaleido renders figures concurrently across browser tabs; one tab per
+# core (capped, each tab holds its own renderer) parallelizes PDF export
+KALEIDO_TABS = min(os.cpu_count() or 1, 8)
+
+
 # --------------------------
 # Data Classes
 # --------------------------
@@ -58,6 +87,45 @@ class ChartConfig:
     units: str
     data: Optional[pd.DataFrame] = None
     narrative: str = ""
+    # Stable identity that survives reordering; title and series can repeat
+    chart_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+# --------------------------
+# Data Caching
+# --------------------------
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_fetch_fred(ids_tuple: tuple[str, ...], start: str) -> pd.DataFrame:
+    """Fetch FRED series once per (series IDs, start) and serve repeats from memory."""
+    return fetch_fred(list(ids_tuple), start=start)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_chart_data(series_id: str, transform: str, frequency: str, start: str) -> pd.DataFrame:
+    """Fetch and transform a single-series chart, cached on its defining inputs."""
+    # Transform the lone column as a Series and only wrap it in a frame at the end
+    series = _cached_fetch_fred((series_id,), start)[series_id]
+    return build_series_for_chart(series, transform, frequency).dropna().to_frame(series_id)
+
+
+def _fingerprint_chart(chart: ChartConfig) -> str:
+    """
+    Cheap identity for a chart's rendered figure.
+    
+    Covers everything create_plotly_chart() draws (the narrative is not
+    part of the figure). The data is summarized by its date span, length
+    and value sum rather than hashed in full.
+    """
+    data = chart.data
+    if data is None or data.empty:
+        data_key = "empty"
+    else:
+        data_key = f"{data.index[0]}|{data.index[-1]}|{len(data)}|{np.nansum(data.to_numpy()):.17g}"
+    return "|".join([
+        chart.series_id, chart.transform, chart.frequency,
+        chart.title, chart.series_label, chart.units, data_key
+    ])
 
 
 # --------------------------
@@ -74,29 +142,28 @@ def init_session_state():
         st.session_state.report_title = "Macro Economic Data Archive"
     if 'start_date' not in st.session_state:
         st.session_state.start_date = "2010-01-01"
+    if 'narrative_batch' not in st.session_state:
+        st.session_state.narrative_batch = None
+    if 'png_cache' not in st.session_state:
+        st.session_state.png_cache = {}
 
 
 # --------------------------
 # AI Integration
 # --------------------------
 
-def generate_narrative(data_summary: str, series_name: str, api_key: str, model: str = "gpt-4o-mini") -> str:
+def build_narrative_messages(data_summary: str, series_name: str) -> List[Dict[str, str]]:
     """
-    Generate professional economic analysis using ChatGPT 4o-mini.
+    Build the chat messages used to request an economic narrative.
     
     Args:
         data_summary: Recent data in CSV or markdown table format
         series_name: Name of the economic series being analyzed
-        api_key: OpenAI API key
-        model: Model to use (default: gpt-4o-mini)
     
     Returns:
-        Generated narrative text
+        System and user messages for the chat completions endpoint
     """
-    try:
-        client = OpenAI(api_key=api_key)
-        
-        system_prompt = """You are a Chief Macro Economist with expertise in economic data analysis. 
+    system_prompt = """You are a Chief Macro Economist with expertise in economic data analysis. 
 Your writing style matches that of Federal Reserve publications and top-tier investment bank strategy notes.
 
 When analyzing data:
@@ -109,7 +176,7 @@ When analyzing data:
 
 Keep analysis to 2-3 paragraphs maximum."""
 
-        user_prompt = f"""Analyze the following economic data for {series_name}.
+    user_prompt = f"""Analyze the following economic data for {series_name}.
 
 Recent Data:
 {data_summary}
@@ -121,26 +188,161 @@ Provide a professional analysis highlighting:
 
 Keep it professional and concise."""
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
-        
-        return response.choices[0].message.content.strip()
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+@functools.lru_cache(maxsize=8)
+def get_openai_client(api_key: str) -> OpenAI:
+    """Return a shared OpenAI client per API key, reusing its connection pool."""
+    return OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_completion(model: str, system_prompt: str, user_prompt: str, key_fp: str, _api_key: str) -> str:
+    """
+    Run a chat completion, reusing the result for an identical prompt and key.
+    
+    key_fp (a SHA-256 fingerprint of the key) scopes cached narratives to the
+    key that paid for them; the raw key is excluded from the cache key
+    (leading underscore), so it is never hashed or stored. Errors propagate
+    and are not cached.
+    """
+    response = get_openai_client(_api_key).chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=NARRATIVE_TEMPERATURE,
+        max_tokens=NARRATIVE_MAX_TOKENS
+    )
+    return response.choices[0].message.content.strip()
+
+
+def generate_narrative(data_summary: str, series_name: str, api_key: str, model: str = "gpt-4o-mini") -> str:
+    """
+    Generate professional economic analysis using ChatGPT 4o-mini.
+    
+    Repeat requests for the same data and model within an hour return the
+    cached narrative without calling the API.
+    
+    Args:
+        data_summary: Recent data in CSV or markdown table format
+        series_name: Name of the economic series being analyzed
+        api_key: OpenAI API key
+        model: Model to use (default: gpt-4o-mini)
+    
+    Returns:
+        Generated narrative text
+    """
+    try:
+        system_msg, user_msg = build_narrative_messages(data_summary, series_name)
+        key_fp = hashlib.sha256(api_key.encode()).hexdigest()
+        return _cached_completion(model, system_msg["content"], user_msg["content"], key_fp, api_key)
     
     except Exception as e:
         return f"Error generating narrative: {str(e)}"
 
 
+def submit_batch_narratives(charts: List[ChartConfig], api_key: str, model: str = "gpt-4o-mini") -> str:
+    """
+    Queue narratives for every chart through the OpenAI Batch API.
+    
+    Batch requests are billed at half the real-time rate and do not count
+    against per-minute rate limits, in exchange for completing within 24h.
+    
+    Args:
+        charts: Charts to analyze; request i is tagged with custom_id "chart_{i}"
+        api_key: OpenAI API key
+        model: Model to use (default: gpt-4o-mini)
+    
+    Returns:
+        ID of the created batch
+    """
+    lines = []
+    for i, chart in enumerate(charts):
+        data_summary = prepare_data_summary(chart.data, chart.series_id, periods=24)
+        lines.append(json.dumps({
+            "custom_id": f"chart_{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": build_narrative_messages(data_summary, chart.series_label),
+                "temperature": NARRATIVE_TEMPERATURE,
+                "max_tokens": NARRATIVE_MAX_TOKENS
+            }
+        }))
+    
+    client = get_openai_client(api_key)
+    batch_file = client.files.create(
+        file=("narratives.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch.id
+
+
+def collect_batch_narratives(batch_id: str, api_key: str) -> Optional[Dict[str, str]]:
+    """
+    Fetch the results of a narrative batch.
+    
+    Args:
+        batch_id: ID returned by submit_batch_narratives()
+        api_key: OpenAI API key
+    
+    An expired or cancelled batch still returns the requests it finished
+    (already billed); unfinished requests are simply absent from the result.
+    
+    Returns:
+        Mapping of custom_id to narrative text, or None while the batch is still running
+    
+    Raises:
+        RuntimeError: If the batch ended without producing any results
+    """
+    client = get_openai_client(api_key)
+    batch = client.batches.retrieve(batch_id)
+    
+    if batch.status not in ("completed", "expired", "cancelled", "failed"):
+        return None
+    if not batch.output_file_id:
+        if batch.status == "completed":
+            raise RuntimeError(f"Batch {batch_id} completed without any successful requests")
+        raise RuntimeError(f"Batch {batch_id} {batch.status}")
+    
+    content = client.files.content(batch.output_file_id).read().decode("utf-8")
+    
+    narratives = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            message = response["body"]["choices"][0]["message"]["content"]
+            narratives[record["custom_id"]] = message.strip()
+        else:
+            # Requests the API rejected carry their error in the response
+            # body; record["error"] is only set when no response was made
+            error = record.get("error") or (response.get("body") or {}).get("error") or {}
+            detail = error.get("message") or f"HTTP {response.get('status_code')}"
+            narratives[record["custom_id"]] = f"Error generating narrative: {detail}"
+    
+    return narratives
+
+
 # --------------------------
 # Chart Visualization
 # --------------------------
 
+@st.cache_data(show_spinner=False, max_entries=256, hash_funcs={ChartConfig: _fingerprint_chart})
 def create_plotly_chart(chart_config: ChartConfig) -> go.Figure:
     """
     Create an interactive Plotly chart from chart configuration.
@@ -163,10 +365,12 @@ def create_plotly_chart(chart_config: ChartConfig) -> go.Figure:
     
     fig = go.Figure()
     
-    # Add trace for the series
+    # Add trace for the series. Values are sent as float32: Plotly encodes
+    # numpy arrays as typed binary, so this halves the y payload per chart
+    # while staying far beyond display precision.
     fig.add_trace(go.Scatter(
         x=chart_config.data.index,
-        y=chart_config.data[chart_config.series_id],
+        y=chart_config.data[chart_config.series_id].to_numpy(dtype=np.float32),
         mode='lines',
         name=chart_config.series_label,
         line=dict(width=2)
@@ -207,8 +411,59 @@ def save_plotly_as_png(fig: go.Figure, output_path: Path) -> None:
         fig: Plotly figure
         output_path: Path to save PNG file
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.write_image(str(output_path), width=1050, height=650, scale=2)
+    save_plotly_figures_as_png([fig], [output_path])
+
+
+async def _render_pngs(specs: List[Dict]) -> None:
+    """Render Kaleido figure specs in one browser, raising on the first failure."""
+    async with kaleido.Kaleido(n=KALEIDO_TABS) as k:
+        await k.write_fig_from_object(specs, cancel_on_error=True)
+
+
+def save_plotly_figures_as_png(figs: List[go.Figure], output_paths: List[Path]) -> None:
+    """
+    Save several Plotly figures as PNGs in one Kaleido session.
+    
+    With Kaleido >= 1.0 every write_image() call launches its own headless
+    Chromium, so each export renders all of its figures in one browser
+    (KALEIDO_TABS tabs at a time) that is closed again when it finishes.
+    Older Plotly/Kaleido versions fall back to one write_image() per figure.
+    
+    Args:
+        figs: Plotly figures
+        output_paths: Matching paths to save PNG files
+    
+    Raises:
+        RuntimeError: If Chrome, which Kaleido >= 1.0 drives, is not installed
+    """
+    for output_path in output_paths:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if hasattr(kaleido, "Kaleido"):
+        from kaleido.errors import ChromeNotFoundError
+        
+        specs = [
+            {
+                "fig": fig.to_dict(),
+                "path": output_path,
+                "opts": {"format": "png", "width": PNG_WIDTH, "height": PNG_HEIGHT, "scale": PNG_SCALE},
+            }
+            for fig, output_path in zip(figs, output_paths)
+        ]
+        try:
+            # A private browser per export: startup failures raise here rather
+            # than stalling a shared server, and concurrent sessions never
+            # share a render queue
+            asyncio.run(_render_pngs(specs))
+        except ChromeNotFoundError:
+            raise RuntimeError(
+                "Kaleido requires Google Chrome to export charts. "
+                "Install it with `plotly_get_chrome` and try again."
+            )
+        return
+    
+    for fig, output_path in zip(figs, output_paths):
+        fig.write_image(str(output_path), width=PNG_WIDTH, height=PNG_HEIGHT, scale=PNG_SCALE)
 
 
 # --------------------------
@@ -236,13 +491,16 @@ def prepare_data_summary(df: pd.DataFrame, series_id: str, periods: int = 24) ->
     if recent_data.empty:
         return "No data available"
     
-    # Format as markdown table
-    table_lines = ["| Date | Value |", "|------|-------|"]
-    for date, value in recent_data.items():
-        date_str = date.strftime("%Y-%m-%d") if hasattr(date, 'strftime') else str(date)
-        table_lines.append(f"| {date_str} | {value:.2f} |")
+    # Format as markdown table, building all rows with vectorized string ops
+    index = recent_data.index
+    if isinstance(index, pd.DatetimeIndex):
+        dates = np.asarray(index.strftime("%Y-%m-%d"), dtype=str)
+    else:
+        dates = np.asarray(index.astype(str), dtype=str)
+    values = np.char.mod("%.2f", recent_data.to_numpy(dtype=np.float64))
+    rows = np.char.add(np.char.add("| ", dates), np.char.add(" | ", np.char.add(values, " |")))
     
-    return "\n".join(table_lines)
+    return "| Date | Value |\n|------|-------|\n" + "\n".join(rows.tolist())
 
 
 # --------------------------
@@ -359,10 +617,9 @@ def add_chart_to_report(title: str, series_id: str, series_label: str,
     try:
         # Fetch data
         with st.spinner(f"Fetching data for {series_id}..."):
-            raw_data = fetch_fred([series_id], start=st.session_state.start_date)
-            transformed_data = build_series_for_chart(
-                raw_data, transform, frequency
-            ).dropna(how="all")
+            transformed_data = _cached_chart_data(
+                series_id, transform, frequency, st.session_state.start_date
+            )
         
         if transformed_data.empty:
             st.error(f"No data available for series {series_id}")
@@ -380,9 +637,10 @@ def add_chart_to_report(title: str, series_id: str, series_label: str,
             narrative=""
         )
         
+        # The sidebar renders before the main area, so the new chart shows up
+        # in this same run without a rerun
         st.session_state.charts.append(chart)
         st.success(f"✅ Added: {title}")
-        st.rerun()
         
     except Exception as e:
         st.error(f"Error adding chart: {str(e)}")
@@ -423,27 +681,41 @@ def render_main_area():
 
 def render_builder_view():
     """Render the interactive builder view."""
+    charts = st.session_state.charts
+    
     st.subheader("Report Builder")
-    st.markdown(f"**{len(st.session_state.charts)}** chart(s) in report")
+    st.markdown(f"**{len(charts)}** chart(s) in report")
     
-    # Export button at top
-    col1, col2, col3 = st.columns([1, 1, 2])
+    # Export button at top. The other actions are on_click callbacks: they
+    # update state before the rerun the click triggers, so no second
+    # st.rerun() is needed.
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
         if st.button("📥 Export to PDF", use_container_width=True):
             export_to_pdf()
     with col2:
-        if st.button("🗑️ Clear All", use_container_width=True):
-            st.session_state.charts = []
-            st.rerun()
+        st.button("🗑️ Clear All", use_container_width=True, on_click=clear_charts)
+    with col3:
+        st.button("🤖 Generate All Analyses", use_container_width=True,
+                  on_click=generate_all_analyses)
+    with col4:
+        if st.session_state.narrative_batch is None:
+            st.button("🌙 Overnight Batch", use_container_width=True,
+                      help="Queue analyses for all charts via the OpenAI Batch API "
+                           "(half the cost, results within 24 hours)",
+                      on_click=submit_overnight_batch)
+        else:
+            st.button("🔄 Check Batch", use_container_width=True,
+                      on_click=check_overnight_batch)
     
     st.markdown("---")
     
     # Render each chart
-    for idx, chart in enumerate(st.session_state.charts):
-        render_chart_card(idx, chart)
+    for idx, chart in enumerate(charts):
+        render_chart_card(idx, chart, len(charts))
 
 
-def render_chart_card(idx: int, chart: ChartConfig):
+def render_chart_card(idx: int, chart: ChartConfig, n_charts: int):
     """Render a single chart card with controls."""
     with st.container():
         st.markdown(f"### {idx + 1}. {chart.title}")
@@ -452,21 +724,19 @@ def render_chart_card(idx: int, chart: ChartConfig):
         col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 3])
         
         with col1:
-            if st.button("🔼", key=f"up_{idx}", disabled=(idx == 0)):
-                move_chart(idx, -1)
+            st.button("🔼", key=f"up_{idx}", disabled=(idx == 0),
+                      on_click=move_chart, args=(idx, -1))
         
         with col2:
-            if st.button("🔽", key=f"down_{idx}", 
-                        disabled=(idx == len(st.session_state.charts) - 1)):
-                move_chart(idx, 1)
+            st.button("🔽", key=f"down_{idx}", disabled=(idx == n_charts - 1),
+                      on_click=move_chart, args=(idx, 1))
         
         with col3:
-            if st.button("🗑️", key=f"delete_{idx}"):
-                delete_chart(idx)
+            st.button("🗑️", key=f"delete_{idx}", on_click=delete_chart, args=(idx,))
         
         with col4:
-            if st.button("🤖 Generate Analysis", key=f"generate_{idx}"):
-                generate_analysis_for_chart(idx)
+            st.button("🤖 Generate Analysis", key=f"generate_{idx}",
+                      on_click=generate_analysis_for_chart, args=(idx,))
         
         # Chart visualization
         fig = create_plotly_chart(chart)
@@ -474,27 +744,15 @@ def render_chart_card(idx: int, chart: ChartConfig):
         
         # Show metadata
         with st.expander("Chart Details"):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Series ID", chart.series_id)
-            with col2:
-                st.metric("Frequency", chart.frequency)
-            with col3:
-                st.metric("Transform", chart.transform)
+            st.markdown(
+                "| Series ID | Frequency | Transform |\n"
+                "|---|---|---|\n"
+                f"| `{chart.series_id}` | {chart.frequency} | {chart.transform} |"
+            )
         
         # Narrative section
         st.markdown("**Economic Analysis:**")
-        narrative = st.text_area(
-            "Edit or generate narrative",
-            value=chart.narrative,
-            height=150,
-            key=f"narrative_{idx}",
-            placeholder="Click 'Generate Analysis' to create AI-powered narrative, or write your own..."
-        )
-        
-        # Update narrative if changed
-        if narrative != chart.narrative:
-            st.session_state.charts[idx].narrative = narrative
+        render_narrative_editor(idx, chart)
         
         st.markdown("---")
 
@@ -524,19 +782,61 @@ def render_preview_view():
 # Chart Management
 # --------------------------
 
+@st.fragment
+def render_narrative_editor(idx: int, chart: ChartConfig):
+    """
+    Render the editable narrative for a chart.
+    
+    Runs as a fragment, so committing an edit reruns only this text area
+    instead of the whole app. The Report Preview tab picks up the edit on
+    the next full rerun.
+    """
+    st.text_area(
+        "Edit or generate narrative",
+        value=chart.narrative,
+        height=150,
+        key=f"narrative_{idx}",
+        on_change=save_narrative,
+        args=(idx,),
+        placeholder="Click 'Generate Analysis' to create AI-powered narrative, or write your own..."
+    )
+
+
+def save_narrative(idx: int):
+    """Copy an edited narrative from its text area into the chart."""
+    st.session_state.charts[idx].narrative = st.session_state[f"narrative_{idx}"]
+
+
 def move_chart(idx: int, direction: int):
     """Move chart up (-1) or down (+1) in the list."""
+    charts = st.session_state.charts
     new_idx = idx + direction
-    if 0 <= new_idx < len(st.session_state.charts):
-        st.session_state.charts[idx], st.session_state.charts[new_idx] = \
-            st.session_state.charts[new_idx], st.session_state.charts[idx]
-        st.rerun()
+    if 0 <= new_idx < len(charts):
+        charts[idx], charts[new_idx] = charts[new_idx], charts[idx]
+        reset_narrative_widgets()
 
 
 def delete_chart(idx: int):
     """Delete chart at given index."""
     st.session_state.charts.pop(idx)
-    st.rerun()
+    reset_narrative_widgets()
+
+
+def clear_charts():
+    """Remove every chart from the report."""
+    st.session_state.charts = []
+    reset_narrative_widgets()
+
+
+def reset_narrative_widgets():
+    """
+    Drop the per-index narrative text area state.
+    
+    Text areas are keyed by position, so after charts are reordered or
+    removed their stored values would belong to a different chart.
+    """
+    for idx in range(len(st.session_state.charts) + 1):
+        st.session_state.pop(f"narrative_{idx}", None)
 
 
 def generate_analysis_for_chart(idx: int):
@@ -563,8 +863,98 @@ def generate_analysis_for_chart(idx: int):
         )
         
         # Update chart
-        st.session_state.charts[idx].narrative = narrative
-        st.rerun()
+        set_chart_narrative(idx, narrative)
+
+
+def generate_all_analyses():
+    """Generate AI narratives for every chart, issuing requests concurrently."""
+    if not st.session_state.openai_api_key:
+        st.error("Please provide an OpenAI API key in the sidebar")
+        return
+    
+    charts = st.session_state.charts
+    api_key = st.session_state.openai_api_key
+    if not charts:
+        return
+    
+    with st.spinner(f"Generating analysis for {len(charts)} chart(s)..."):
+        # Build prompts up front; worker threads only talk to the API
+        jobs = [
+            (prepare_data_summary(chart.data, chart.series_id, periods=24), chart.series_label)
+            for chart in charts
+        ]
+        
+        workers = min(NARRATIVE_MAX_WORKERS, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            narratives = list(pool.map(
+                lambda job: generate_narrative(job[0], job[1], api_key),
+                jobs
+            ))
+        
+        for idx, narrative in enumerate(narratives):
+            set_chart_narrative(idx, narrative)
+
+
+def submit_overnight_batch():
+    """Submit analyses for every chart as an OpenAI batch job."""
+    if not st.session_state.openai_api_key:
+        st.error("Please provide an OpenAI API key in the sidebar")
+        return
+    
+    charts = st.session_state.charts
+    try:
+        with st.spinner("Submitting batch..."):
+            batch_id = submit_batch_narratives(charts, st.session_state.openai_api_key)
+    except Exception as e:
+        st.error(f"Error submitting batch: {str(e)}")
+        return
+    
+    # Remember which chart each request belongs to, since charts may be
+    # reordered or deleted before the batch completes
+    st.session_state.narrative_batch = {
+        "id": batch_id,
+        "charts": {f"chart_{i}": c.chart_id for i, c in enumerate(charts)}
+    }
+
+
+def check_overnight_batch():
+    """Apply results from the pending OpenAI batch job, if it has finished."""
+    batch = st.session_state.narrative_batch
+    try:
+        with st.spinner("Checking batch..."):
+            results = collect_batch_narratives(batch["id"], st.session_state.openai_api_key)
+    except RuntimeError as e:
+        # Terminal batch state; allow a fresh submission
+        st.session_state.narrative_batch = None
+        st.error(str(e))
+        return
+    except Exception as e:
+        st.error(f"Error retrieving batch: {str(e)}")
+        return
+    
+    if results is None:
+        st.info("Batch is still running. Check back later.")
+        return
+    
+    for custom_id, narrative in results.items():
+        chart_id = batch["charts"].get(custom_id)
+        for idx, chart in enumerate(st.session_state.charts):
+            if chart.chart_id == chart_id:
+                set_chart_narrative(idx, narrative)
+                break
+    
+    missing = len(batch["charts"]) - len(results)
+    if missing > 0:
+        st.warning(f"The batch ended before {missing} chart(s) were analyzed; generate those individually.")
+    
+    st.session_state.narrative_batch = None
+
+
+def set_chart_narrative(idx: int, narrative: str):
+    """Store a generated narrative and reset the chart's text area to show it."""
+    st.session_state.charts[idx].narrative = narrative
+    # The keyed text area keeps its own state; drop it so it re-reads the new value
+    st.session_state.pop(f"narrative_{idx}", None)
 
 
 # --------------------------
@@ -583,13 +973,28 @@ def export_to_pdf():
             tmpdir = Path("_charts_tmp")
             tmpdir.mkdir(exist_ok=True)
             
-            # Save charts as static images
-            png_paths = []
-            for idx, chart in enumerate(st.session_state.charts):
-                fig = create_plotly_chart(chart)
-                png_path = tmpdir / f"chart_{idx:03d}.png"
-                save_plotly_as_png(fig, png_path)
-                png_paths.append(png_path)
+            # Save charts as static images, rendering only charts whose
+            # figure changed since the last export
+            charts = st.session_state.charts
+            fingerprints = [_fingerprint_chart(chart) for chart in charts]
+            png_paths = [tmpdir / f"chart_{idx:03d}.png" for idx in range(len(charts))]
+            png_cache = st.session_state.png_cache
+            
+            stale = [idx for idx, fp in enumerate(fingerprints) if fp not in png_cache]
+            if stale:
+                save_plotly_figures_as_png(
+                    [create_plotly_chart(charts[idx]) for idx in stale],
+                    [png_paths[idx] for idx in stale]
+                )
+                for idx in stale:
+                    png_cache[fingerprints[idx]] = png_paths[idx].read_bytes()
+            
+            for idx, fp in enumerate(fingerprints):
+                if idx not in stale:
+                    png_paths[idx].write_bytes(png_cache[fp])
+            
+            # Keep only images belonging to the current report
+            st.session_state.png_cache = {fp: png_cache[fp] for fp in fingerprints}
             
             # Generate PDF
             output_path = tmpdir / "report.pdf"
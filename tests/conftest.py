@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Import the package from src/ without requiring an install
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
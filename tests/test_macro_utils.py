@@ -0,0 +1,307 @@
+"""
+Tests for macro_utils transforms.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from conftest import SRC
+from macro_econ_data_archive import macro_utils
+
+
+def _ladder_yoy_periods(freq):
+    # The prefix ladder infer_yoy_periods replaced
+    f = freq.lower()
+    if f.startswith("m"):
+        return 12
+    if f.startswith("q"):
+        return 4
+    if f.startswith("w"):
+        return 52
+    if f.startswith("d"):
+        return 365
+    return 12
+
+
+@pytest.mark.parametrize("freq, expected", [
+    ("Monthly", 12),
+    ("QUARTERLY", 4),
+    ("weekly", 52),
+    ("daily", 365),
+    ("monthly", 12),
+    ("q", 4),
+    ("annual", 12),
+    ("", 12),
+])
+def test_infer_yoy_periods_matches_prefix_ladder(freq, expected):
+    assert macro_utils.infer_yoy_periods(freq) == expected
+    assert macro_utils.infer_yoy_periods(freq) == _ladder_yoy_periods(freq)
+
+
+@pytest.fixture(params=["numba", "numexpr", "numpy"])
+def transform_path(request, monkeypatch):
+    """Force yoy/qoq_saar onto one implementation, whatever the input size."""
+    if request.param == "numba":
+        if macro_utils.njit is None:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(macro_utils, "FAST_PATH_MIN_LENGTH", 0)
+    elif request.param == "numexpr":
+        if macro_utils.numexpr is None:
+            pytest.skip("numexpr not installed")
+        monkeypatch.setattr(macro_utils, "FAST_PATH_MIN_LENGTH", 0)
+        monkeypatch.setattr(macro_utils, "njit", None)
+    else:
+        monkeypatch.setattr(macro_utils, "FAST_PATH_MIN_LENGTH", float("inf"))
+    return request.param
+
+
+def _sample_series(name="A"):
+    # Gaps, zeros (x/0 -> inf, 0/0 -> NaN) and a negative level
+    values = np.linspace(90.0, 130.0, 30)
+    values[[3, 17]] = np.nan
+    values[[8, 9]] = 0.0
+    values[22] = -5.0
+    idx = pd.date_range("2000-01-01", periods=len(values), freq="MS")
+    return pd.Series(values, index=idx, name=name)
+
+
+def _sample_inputs():
+    s = _sample_series()
+    df = pd.concat([s, _sample_series("B")[::-1].set_axis(s.index)], axis=1)
+    empty = pd.Series([], dtype="float64", index=pd.DatetimeIndex([]), name="A")
+    return {"series": s, "frame": df, "empty": empty}
+
+
+def _assert_same(result, expected):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-12)
+    else:
+        pd.testing.assert_series_equal(result, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("kind", ["series", "frame", "empty"])
+@pytest.mark.parametrize("periods", [1, 4, 12, 30, 45])
+def test_yoy_matches_pandas(transform_path, kind, periods):
+    data = _sample_inputs()[kind]
+    expected = 100.0 * (data / data.shift(periods) - 1.0)
+    _assert_same(macro_utils.yoy(data, periods), expected)
+
+
+@pytest.mark.parametrize("kind", ["series", "frame", "empty"])
+def test_qoq_saar_matches_pandas(transform_path, kind):
+    data = _sample_inputs()[kind]
+    expected = 100.0 * ((data / data.shift(1)) ** 4 - 1.0)
+    _assert_same(macro_utils.qoq_saar(data), expected)
+
+
+def test_single_row_qoq_saar_is_nan(transform_path):
+    data = _sample_series().iloc[:1]
+    assert macro_utils.qoq_saar(data).isna().all()
+
+
+@pytest.fixture(params=["pyarrow", "c"])
+def csv_engine(request, monkeypatch):
+    if request.param == "pyarrow" and macro_utils.pyarrow is None:
+        pytest.skip("pyarrow not installed")
+    monkeypatch.setattr(macro_utils, "_CSV_ENGINE", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("date_col", ["observation_date", "DATE"])
+def test_parse_fred_csv_parses_dates_while_reading(csv_engine, date_col, monkeypatch):
+    def no_fallback(*args, **kwargs):
+        raise AssertionError("dates were re-parsed after reading")
+
+    monkeypatch.setattr(macro_utils.pd, "to_datetime", no_fallback)
+    body = f"{date_col},B,A\n2020-02-01,.,2.5\n2020-01-01,1,1.5\n".encode()
+    df = macro_utils._parse_fred_csv(body, ["A", "B"])
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert list(df.index) == [pd.Timestamp("2020-01-01"), pd.Timestamp("2020-02-01")]
+    assert list(df.columns) == ["A", "B"]
+    assert (df.dtypes == np.float64).all()
+    assert np.isnan(df.loc["2020-02-01", "B"])
+
+
+def test_parse_fred_csv_drops_malformed_dates(csv_engine):
+    body = b"observation_date,A\n2020-01-01,1.5\nbogus,2\n2020-03-01,3\n"
+    df = macro_utils._parse_fred_csv(body, ["A"])
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df["A"].tolist() == [1.5, 3.0]
+
+
+def test_parse_fred_csv_rejects_non_csv_body(csv_engine):
+    with pytest.raises(ValueError, match="missing date column"):
+        macro_utils._parse_fred_csv(b"<html><body>Try again later</body></html>", ["A"])
+
+
+class FakeFred:
+    """Stand-in for macro_utils._SESSION.get, serving fredgraph.csv from memory."""
+
+    def __init__(self):
+        self.series = {
+            "A": pd.Series(np.arange(1.0, 25.0), index=pd.date_range("2019-01-01", periods=24, freq="MS")),
+            "B": pd.Series(np.arange(1.0, 9.0) * 10, index=pd.date_range("2019-01-01", periods=8, freq="QS")),
+        }
+        self.urls = []
+        self.body = None  # when set, served for every request
+        self.ignore_cosd = False
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        query = parse_qs(urlparse(url).query)
+        ids = query["id"][0].split(",")
+        # cosd is per line, one value per series
+        starts = query["cosd"][0].split(",")
+        if self.ignore_cosd:
+            starts = [None] * len(ids)
+        response = requests.Response()
+        response.url = url
+        if any(sid not in self.series for sid in ids):
+            response.status_code = 400
+            response._content = b"Bad Request"
+            return response
+        response.status_code = 200
+        if self.body is not None:
+            response._content = self.body
+        else:
+            frame = pd.concat(
+                {sid: self.series[sid].loc[start:] for sid, start in zip(ids, starts)}, axis=1, sort=True
+            )
+            response._content = frame.to_csv(index_label="observation_date", na_rep=".").encode()
+        return response
+
+
+@pytest.fixture
+def fred(monkeypatch, tmp_path):
+    fake = FakeFred()
+    monkeypatch.setattr(macro_utils._SESSION, "get", fake.get)
+    monkeypatch.setattr(macro_utils, "CACHE_DIR", tmp_path)
+    return fake
+
+
+def test_fetch_fred_reuses_cached_response(fred):
+    first = macro_utils.fetch_fred(["A"], start="2019-01-01")
+    second = macro_utils.fetch_fred(["A"], start="2019-01-01")
+    pd.testing.assert_frame_equal(first, second)
+    assert len(fred.urls) == 1
+    assert [p.name for p in macro_utils.CACHE_DIR.iterdir()] == ["A_2019-01-01.csv"]
+
+
+def test_fetch_fred_does_not_cache_invalid_response(fred):
+    fred.body = b"<html><body>Please try again later</body></html>"
+    with pytest.raises(Exception, match="Failed to fetch data for A"):
+        macro_utils.fetch_fred(["A"], start="2019-01-01")
+    assert list(macro_utils.CACHE_DIR.iterdir()) == []
+
+    fred.body = None
+    assert len(macro_utils.fetch_fred(["A"], start="2019-01-01")) == 24
+    assert len(fred.urls) == 2
+
+
+def test_failed_cache_write_leaves_no_temp_file(fred, monkeypatch):
+    def fail_replace(src, dst):
+        raise OSError("read-only cache")
+
+    monkeypatch.setattr(macro_utils.os, "replace", fail_replace)
+    assert len(macro_utils.fetch_fred(["A"], start="2019-01-01")) == 24
+    assert list(macro_utils.CACHE_DIR.iterdir()) == []
+
+
+@pytest.mark.parametrize("series_ids", [["A"], ["A", "B"]])
+def test_fetch_fred_trims_untrimmed_response_to_start(fred, series_ids):
+    fred.ignore_cosd = True
+    df = macro_utils.fetch_fred(series_ids, start="2020-01-01")
+    assert df.index[0] == pd.Timestamp("2020-01-01")
+    assert df["A"].iloc[0] == 13.0
+
+
+def test_fetch_fred_batches_series_in_one_request(fred):
+    df = macro_utils.fetch_fred(["B", "A"], start="2019-04-01")
+    assert len(fred.urls) == 1
+    query = parse_qs(urlparse(fred.urls[0]).query)
+    assert query["id"] == ["B,A"]
+    assert query["cosd"] == ["2019-04-01,2019-04-01"]
+    assert list(df.columns) == ["B", "A"]
+    # Aligned on the union of dates: monthly A, quarterly B
+    assert len(df) == 21
+    assert df["B"].count() == 7
+
+
+def test_fetch_fred_batch_matches_per_series_fetches(fred):
+    batched = macro_utils.fetch_fred(["A", "B"], start="2019-01-01")
+    singles = pd.concat(
+        {sid: macro_utils.fetch_fred([sid], start="2019-01-01")[sid] for sid in ["A", "B"]}, axis=1, sort=True
+    )
+    pd.testing.assert_frame_equal(batched, singles, check_freq=False)
+
+
+def test_fetch_fred_collapses_duplicate_ids(fred):
+    df = macro_utils.fetch_fred(["A", "B", "A"], start="2019-01-01")
+    assert list(df.columns) == ["A", "B"]
+    assert parse_qs(urlparse(fred.urls[0]).query)["id"] == ["A,B"]
+
+
+def test_fetch_fred_falls_back_per_series_on_bad_id(fred):
+    with pytest.raises(Exception, match="Failed to fetch data for BAD"):
+        macro_utils.fetch_fred(["A", "BAD"], start="2019-01-01")
+    ids = sorted(parse_qs(urlparse(url).query)["id"][0] for url in fred.urls)
+    assert ids == ["A", "A,BAD", "BAD"]
+
+
+def test_fetch_fred_reports_non_400_batch_errors(fred, monkeypatch):
+    def unavailable(url, timeout=None):
+        fred.urls.append(url)
+        response = requests.Response()
+        response.status_code = 503
+        response.url = url
+        return response
+
+    monkeypatch.setattr(macro_utils._SESSION, "get", unavailable)
+    with pytest.raises(Exception, match="Failed to fetch data for A, B"):
+        macro_utils.fetch_fred(["A", "B"], start="2019-01-01")
+    assert len(fred.urls) == 1
+
+
+def test_fetch_fred_caches_batches_under_joined_ids(fred):
+    macro_utils.fetch_fred(["A", "B"], start="2019-01-01")
+    macro_utils.fetch_fred(["A", "B"], start="2019-01-01")
+    assert len(fred.urls) == 1
+    assert [p.name for p in macro_utils.CACHE_DIR.iterdir()] == ["A%2CB_2019-01-01.csv"]
+
+
+def test_fetch_fred_without_ids_returns_empty_frame(fred):
+    assert macro_utils.fetch_fred([]).empty
+    assert fred.urls == []
+
+
+def test_fast_path_in_worker_thread_lets_process_exit():
+    # Streamlit runs scripts on a worker thread; a transform started there
+    # must not leave threads behind that block interpreter shutdown
+    code = textwrap.dedent("""
+        import threading
+
+        def work():
+            import numpy as np
+            import pandas as pd
+            from macro_econ_data_archive import macro_utils
+
+            n = macro_utils.FAST_PATH_MIN_LENGTH * 2
+            df = pd.DataFrame(np.random.default_rng(0).random((n, 2)) + 1.0)
+            macro_utils.yoy(df, periods=12)
+            macro_utils.qoq_saar(df)
+
+        t = threading.Thread(target=work)
+        t.start()
+        t.join()
+    """)
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    result = subprocess.run([sys.executable, "-c", code], env=env, timeout=120)
+    assert result.returncode == 0